@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# Alphabet profiles compiled into translation tables - NumPy optional
+#
+# Each profile lists the letters it counts and a str.translate table that
+# lowercases and folds every variant (capitals, accents, final sigma...) onto
+# those letters. Counting is then one translate call plus one Counter pass
+# instead of isalpha()/lower() calls on every character.
+
+import argparse
+import time
+import unicodedata
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # the table-driven str path works without NumPy
+    np = None
+
+# Letters folded to more than one base letter
+_LIGATURES = {'ß': 'ss', 'ẞ': 'ss', 'æ': 'ae', 'Æ': 'ae', 'œ': 'oe', 'Œ': 'oe',
+              'ĳ': 'ij', 'Ĳ': 'ij', 'þ': 'th', 'Þ': 'th'}
+# Letters whose decomposition does not reveal the base letter
+_LATIN_SPECIALS = {'ø': 'o', 'Ø': 'o', 'đ': 'd', 'Đ': 'd', 'ł': 'l', 'Ł': 'l',
+                   'ħ': 'h', 'Ħ': 'h', 'ı': 'i', 'ŀ': 'l', 'Ŀ': 'l', 'ð': 'd',
+                   'Ð': 'd', 'ŧ': 't', 'Ŧ': 't'}
+
+
+def _base_letter(char):
+    """First character of the canonical decomposition, lowercased"""
+    return unicodedata.normalize('NFD', char)[0].lower()
+
+
+class Alphabet:
+    """A set of letters plus the table that maps text onto them"""
+
+    def __init__(self, name, letters, folds=None):
+        self.name = name
+        self.letters = letters
+        self.letter_set = frozenset(letters)
+        table = {}
+        for letter in letters:
+            upper = letter.upper()
+            if len(upper) == 1 and upper != letter:
+                table[ord(upper)] = letter
+        table.update((ord(k), v) for k, v in (folds or {}).items())
+        self.table = table
+        self._lookup = None
+
+    def normalize(self, text):
+        """Lowercase and fold text onto this alphabet (other characters kept)"""
+        return text.translate(self.table)
+
+    def count(self, text):
+        """Letter counts of text as a dict, like count_letters"""
+        counts = Counter(text.translate(self.table))
+        letter_set = self.letter_set
+        return {c: counts[c] for c in sorted(counts) if c in letter_set}
+
+    def count_array(self, text):
+        """Letter counts as a NumPy array aligned with self.letters"""
+        if np is None:
+            raise RuntimeError("count_array needs NumPy")
+        if self._lookup is None:
+            # Code point -> letter index; the extra last slot catches everything else
+            size = max(map(ord, self.letters)) + 2
+            lookup = np.full(size, len(self.letters), dtype=np.intp)
+            for i, letter in enumerate(self.letters):
+                lookup[ord(letter)] = i
+            self._lookup = lookup
+        codes = np.frombuffer(text.translate(self.table).encode('utf-32-le'), dtype=np.uint32)
+        indexes = self._lookup[np.minimum(codes, len(self._lookup) - 1)]
+        return np.bincount(indexes, minlength=len(self.letters) + 1)[:-1]
+
+    def __repr__(self):
+        return f"Alphabet({self.name!r}, {self.letters!r})"
+
+
+def _latin_folds():
+    """Fold Latin-1 and Latin Extended-A/B letters onto a-z"""
+    folds = dict(_LIGATURES)
+    folds.update(_LATIN_SPECIALS)
+    for code in range(0xC0, 0x250):
+        char = chr(code)
+        if char in folds or not char.isalpha():
+            continue
+        base = _base_letter(char)
+        if 'a' <= base <= 'z':
+            folds[char] = base
+    return folds
+
+
+def _greek_folds():
+    """Drop Greek accents and map final sigma onto sigma"""
+    folds = {'ς': 'σ'}
+    for code in range(0x370, 0x400):
+        char = chr(code)
+        if not char.isalpha():
+            continue
+        base = _base_letter(char)
+        if 'α' <= base <= 'ω' and base != char:
+            folds[char] = base
+    return folds
+
+
+ALPHABETS = {
+    'english': Alphabet('english', 'abcdefghijklmnopqrstuvwxyz'),
+    'latin': Alphabet('latin', 'abcdefghijklmnopqrstuvwxyz', _latin_folds()),
+    'cyrillic': Alphabet('cyrillic', 'абвгдеёжзийклмнопрстуфхцчшщъыьэюяіїєґў'),
+    'greek': Alphabet('greek', 'αβγδεζηθικλμνξοπρστυφχψω', _greek_folds()),
+}
+
+
+def get_alphabet(alphabet):
+    """Look up a profile by name, or build one from a string of letters"""
+    if isinstance(alphabet, Alphabet):
+        return alphabet
+    if alphabet in ALPHABETS:
+        return ALPHABETS[alphabet]
+    if alphabet and alphabet.isalpha():
+        letters = ''.join(dict.fromkeys(alphabet.lower()))
+        return Alphabet(letters, letters)
+    raise ValueError(f"unknown alphabet '{alphabet}', expected one of "
+                     f"{', '.join(ALPHABETS)} or a string of letters")
+
+
+def count_letters_per_char(text, alphabet):
+    """Reference per-character version of Alphabet.count, for benchmarks"""
+    freq = {}
+    for char in text.lower():
+        if char.isalpha():
+            char = alphabet.table.get(ord(char), char)
+            for letter in char:
+                if letter in alphabet.letter_set:
+                    freq[letter] = freq.get(letter, 0) + 1
+    return freq
+
+
+def benchmark(size=1000000, repeat=3):
+    """Compare table-driven counting with per-character method calls"""
+    samples = {
+        'english': "The quick brown fox jumps over the lazy dog. ",
+        'latin': "Ça déjà été très naïve, Straße für Ærø og Łódź. ",
+        'cyrillic': "Съешь же ещё этих мягких французских булок, да выпей чаю. ",
+        'greek': "Ξεσκεπάζω την ψυχοφθόρα βδελυγμία. Σοφός. ",
+    }
+    results = []
+    for name, sample in samples.items():
+        alphabet = ALPHABETS[name]
+        text = sample * (size // len(sample))
+        timings = {}
+        paths = [('per-char', lambda: count_letters_per_char(text, alphabet)),
+                 ('translate', lambda: alphabet.count(text))]
+        if np is not None:
+            paths.append(('numpy', lambda: alphabet.count_array(text)))
+        for label, func in paths:
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[label] = best
+        results.append((name, len(text), timings))
+    return results
+
+
+def main():
+    """Count letters with an alphabet profile, or benchmark the profiles"""
+    parser = argparse.ArgumentParser(description="Alphabet profiles")
+    parser.add_argument("text", nargs="*")
+    parser.add_argument("--alphabet", default='english',
+                        help=f"one of {', '.join(ALPHABETS)} or a string of letters")
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for name, length, timings in benchmark():
+            baseline = timings['per-char']
+            line = ", ".join(f"{label} {t * 1000:.1f} ms ({baseline / t:.1f}x)"
+                             for label, t in timings.items())
+            print(f"{name:9} {length:,} chars: {line}")
+        return
+
+    try:
+        alphabet = get_alphabet(args.alphabet)
+    except ValueError as e:
+        parser.error(str(e))
+    for letter, count in alphabet.count(" ".join(args.text)).items():
+        print(f"  '{letter}': {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ import scipy.stats as stats
 import pandas as pd
 import json
 from io import StringIO
+from concurrent.futures.process import BrokenProcessPool
+from sampling_simulator import simulate
+from serving import get_pool, offload, restart_pool
 
 app = Flask(__name__)
 
@@ -23,12 +26,8 @@ def hypothesis_testing():
 def correlation():
     return render_template('correlation.html')
 
-@app.route('/api/generate_distribution', methods=['POST'])
-def generate_distribution():
-    data = request.json
-    dist_type = data['type']
-    params = data['params']
-    
+def draw_distribution(dist_type, params):
+    """Draw samples and the theoretical curve for /api/generate_distribution"""
     samples = None
     theoretical = None
     pdf = None
@@ -45,19 +44,67 @@ def generate_distribution():
         samples = np.random.binomial(params['n'], params['p'], 1000)
         theoretical = np.arange(0, params['n'] + 1)
         pmf = stats.binom.pmf(theoretical, params['n'], params['p'])
-        return jsonify({
+        return {
             'samples': samples.tolist(),
             'theoretical': theoretical.tolist(),
             'pmf': pmf.tolist(),
             'type': 'discrete'
-        })
+        }
     
-    return jsonify({
+    return {
         'samples': samples.tolist(),
         'theoretical': theoretical.tolist(),
         'pdf': pdf.tolist(),
         'type': 'continuous'
-    })
+    }
+
+@app.route('/api/generate_distribution', methods=['POST'])
+def generate_distribution():
+    data = request.json
+    dist_type = data['type']
+    params = data['params']
+    
+    # The draws are CPU-bound; serving mode runs them in the process pool
+    return jsonify(offload(draw_distribution, dist_type, params))
+
+@app.route('/api/sampling_distribution', methods=['POST'])
+def sampling_distribution():
+    data = request.json
+    try:
+        repetitions = int(data.get('repetitions', 100000))
+        sample_size = int(data.get('sample_size', 30))
+        bins = int(data.get('bins', 60))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'repetitions, sample_size and bins must be whole numbers'})
+    
+    if repetitions > 10**7:
+        return jsonify({'error': 'At most 10,000,000 repetitions are allowed'})
+    if sample_size > 10**5:
+        return jsonify({'error': 'Sample size can be at most 100,000'})
+    if repetitions * sample_size > 10**9:
+        return jsonify({'error': 'At most 1,000,000,000 values can be drawn per request'})
+    if bins > 1000:
+        return jsonify({'error': 'At most 1,000 bins are allowed'})
+    
+    # Blocks share the serving-mode process pool when there is one; without
+    # it (the development server) they run inline rather than in a new pool
+    pool = get_pool()
+    try:
+        result = simulate(data.get('type'), data.get('params', {}),
+                          statistic=data.get('statistic', 'mean'),
+                          sample_size=sample_size,
+                          repetitions=repetitions,
+                          bins=bins,
+                          workers=1 if pool is None else None,
+                          executor=pool)
+    except ValueError as e:
+        return jsonify({'error': str(e)})
+    except BrokenProcessPool:
+        # Replace the pool; serving mode's error handler answers with 503
+        restart_pool(pool)
+        raise
+    
+    return jsonify(result)
 
 @app.route('/api/hypothesis_test', methods=['POST'])
 def hypothesis_test():
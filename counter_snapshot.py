@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# Binary snapshots of letter and word counts - No external libraries needed
+#
+# Snapshot layout (all integers little-endian):
+#
+#   header   magic "LFCS", version, flags, resume offset, input size,
+#            vocabulary size, extra letter count, alphabet name length,
+#            CRC32 of everything after the fixed header. Flag bit 0 marks
+#            merged snapshots, which cover several inputs and cannot be
+#            resumed.
+#   alphabet UTF-8 name of the alphabet profile the letters were counted
+#            with (empty for the default isalpha() counting)
+#   letters  26 x uint64 counts for 'a'..'z'
+#   extras   other letters as (varint code point, varint count), sorted
+#   words    vocabulary sorted by UTF-8 bytes, front-coded as
+#            (varint shared prefix, varint suffix length, suffix, varint count)
+
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections import Counter
+
+from alphabets import get_alphabet
+from simple_analyzer import count_letters, count_words
+
+MAGIC = b"LFCS"
+VERSION = 3
+HEADER = struct.Struct("<4sHHQQQIHI")
+FLAG_MERGED = 1
+LETTERS = struct.Struct("<26Q")
+ASCII_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+# ASCII bytes that str.split() treats as whitespace; cutting text after one of
+# these never splits a word or a UTF-8 sequence
+WHITESPACE_BYTES = b" \t\n\r\x0b\x0c"
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is truncated, corrupt or unsupported"""
+
+
+class Snapshot:
+    """Letter and word counts plus the input byte offset they cover
+
+    alphabet is the profile name the letters were counted with, or None.
+    """
+
+    def __init__(self, letters=None, words=None, offset=0, source_size=0, flags=0,
+                 alphabet=None):
+        self.letters = Counter(letters or {})
+        self.words = Counter(words or {})
+        self.offset = offset
+        self.source_size = source_size
+        self.flags = flags
+        self.alphabet = alphabet
+
+    @property
+    def merged(self):
+        return bool(self.flags & FLAG_MERGED)
+
+    def update(self, letters, words):
+        """Add counts from count_letters/count_words to this snapshot"""
+        self.letters.update(letters)
+        self.words.update(words)
+
+
+def encode_varint(value, out):
+    """Append an unsigned LEB128 varint to a bytearray"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(buf, pos):
+    """Read a varint from buf at pos and return (value, new_pos)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _encode_letters(letters):
+    """Split letter counts into the fixed a-z array and the extras section"""
+    fixed = LETTERS.pack(*(letters.get(l, 0) for l in ASCII_LETTERS))
+    extras = bytearray()
+    others = sorted((ord(l), c) for l, c in letters.items()
+                    if l not in ASCII_LETTERS and c)
+    for codepoint, count in others:
+        encode_varint(codepoint, extras)
+        encode_varint(count, extras)
+    return fixed + extras, len(others)
+
+
+def _encode_words(items, out):
+    """Front-code (word_bytes, count) pairs, already sorted, into out"""
+    previous = b""
+    size = 0
+    for word, count in items:
+        shared = 0
+        limit = min(len(previous), len(word))
+        while shared < limit and previous[shared] == word[shared]:
+            shared += 1
+        encode_varint(shared, out)
+        encode_varint(len(word) - shared, out)
+        out += word[shared:]
+        encode_varint(count, out)
+        previous = word
+        size += 1
+    return size
+
+
+def alphabet_name(alphabet):
+    """Canonical name of an alphabet argument as stored in snapshots, or None"""
+    return get_alphabet(alphabet).name if alphabet else None
+
+
+def _pack(flags, offset, source_size, alphabet, vocab_size, extra_count, body):
+    """Fixed header plus alphabet name, checksummed together with body"""
+    name = (alphabet or "").encode("utf-8")
+    crc = zlib.crc32(body, zlib.crc32(name))
+    return HEADER.pack(MAGIC, VERSION, flags, offset, source_size, vocab_size,
+                       extra_count, len(name), crc) + name
+
+
+def encode_snapshot(snapshot):
+    """Serialize a Snapshot to bytes"""
+    body, extra_count = _encode_letters(snapshot.letters)
+    body = bytearray(body)
+    words = sorted((w.encode("utf-8"), c) for w, c in snapshot.words.items() if c)
+    vocab_size = _encode_words(words, body)
+    header = _pack(snapshot.flags, snapshot.offset, snapshot.source_size,
+                   snapshot.alphabet, vocab_size, extra_count, body)
+    return header + bytes(body)
+
+
+def _read_header(buf):
+    """Validate the header and checksum, returning the unpacked fields
+
+    The last field is the position where the letter counts start.
+    """
+    if len(buf) < HEADER.size:
+        raise SnapshotError("snapshot is truncated")
+    (magic, version, flags, offset, source_size, vocab_size, extra_count,
+     name_size, crc) = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise SnapshotError("not a letter frequency snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"unsupported snapshot version {version}")
+    letters_at = HEADER.size + name_size
+    if len(buf) < letters_at + LETTERS.size:
+        raise SnapshotError("snapshot is truncated")
+    # Checksum through a memoryview so an mmap'd body is not copied
+    with memoryview(buf) as view, view[HEADER.size:] as body:
+        if zlib.crc32(body) != crc:
+            raise SnapshotError("snapshot checksum mismatch")
+    try:
+        alphabet = bytes(buf[HEADER.size:letters_at]).decode("utf-8") or None
+    except UnicodeDecodeError:
+        raise SnapshotError("snapshot alphabet name is not UTF-8") from None
+    return flags, offset, source_size, alphabet, vocab_size, extra_count, letters_at
+
+
+def _decode_letters(buf, extra_count, pos):
+    """Read the letter sections at pos, returning (letters, position of words)"""
+    letters = {l: c for l, c in zip(ASCII_LETTERS, LETTERS.unpack_from(buf, pos)) if c}
+    pos += LETTERS.size
+    for _ in range(extra_count):
+        codepoint, pos = decode_varint(buf, pos)
+        count, pos = decode_varint(buf, pos)
+        letters[chr(codepoint)] = count
+    return letters, pos
+
+
+def _iter_encoded_words(buf, pos, vocab_size):
+    """Yield (word_bytes, count) from the front-coded vocabulary"""
+    previous = b""
+    for _ in range(vocab_size):
+        shared, pos = decode_varint(buf, pos)
+        length, pos = decode_varint(buf, pos)
+        word = previous[:shared] + buf[pos:pos + length]
+        pos += length
+        count, pos = decode_varint(buf, pos)
+        yield word, count
+        previous = word
+
+
+def decode_snapshot(buf):
+    """Deserialize bytes produced by encode_snapshot"""
+    (flags, offset, source_size, alphabet, vocab_size, extra_count,
+     letters_at) = _read_header(buf)
+    letters, pos = _decode_letters(buf, extra_count, letters_at)
+    words = {w.decode("utf-8"): c for w, c in _iter_encoded_words(buf, pos, vocab_size)}
+    return Snapshot(letters, words, offset, source_size, flags, alphabet)
+
+
+def load_snapshot(path):
+    """Load a snapshot file through mmap"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return decode_snapshot(buf)
+
+
+def save_snapshot(snapshot, path):
+    """Write a snapshot atomically so a crash never leaves a torn file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_snapshot(snapshot))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _grouped(merged):
+    """Sum counts of equal keys in an already sorted stream of pairs"""
+    current = None
+    total = 0
+    for word, count in merged:
+        if word != current:
+            if current is not None:
+                yield current, total
+            current = word
+            total = 0
+        total += count
+    if current is not None:
+        yield current, total
+
+
+def merge_snapshots(paths, out_path):
+    """K-way merge snapshot files into out_path, streaming each vocabulary"""
+    files = []
+    maps = []
+    try:
+        for path in paths:
+            files.append(open(path, "rb"))
+            maps.append(mmap.mmap(files[-1].fileno(), 0, access=mmap.ACCESS_READ))
+        letters = Counter()
+        streams = []
+        alphabets = set()
+        for path, buf in zip(paths, maps):
+            _, _, _, alphabet, vocab_size, extra_count, letters_at = _read_header(buf)
+            alphabets.add(alphabet)
+            if len(alphabets) > 1:
+                raise SnapshotError(f"{path} was counted with a different alphabet "
+                                    f"than {paths[0]}")
+            part, pos = _decode_letters(buf, extra_count, letters_at)
+            letters.update(part)
+            streams.append(_iter_encoded_words(buf, pos, vocab_size))
+
+        body, extra_count = _encode_letters(letters)
+        body = bytearray(body)
+        vocab_size = _encode_words(_grouped(heapq.merge(*streams)), body)
+        # Merged counts cover several inputs, so they are flagged as not resumable
+        header = _pack(FLAG_MERGED, 0, 0, alphabets.pop() if alphabets else None,
+                       vocab_size, extra_count, body)
+        tmp_path = out_path + ".tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(header)
+            out.write(body)
+        os.replace(tmp_path, out_path)
+    finally:
+        for buf in maps:
+            buf.close()
+        for f in files:
+            f.close()
+
+
+def boundary_at_or_after(f, position, size):
+    """Return the first offset >= position that starts a word or ends the file"""
+    if position <= 0:
+        return 0
+    f.seek(position - 1)
+    while position < size:
+        block = f.read(65536)
+        if not block:
+            break
+        for i, byte in enumerate(block):
+            if byte in WHITESPACE_BYTES:
+                return position + i
+        position += len(block)
+    return size
+
+
+def read_chunks(f, start, end, chunk_size=1 << 20):
+    """Yield (text, end_offset) pieces of f[start:end] cut at whitespace
+
+    start and end must already be word boundaries (see boundary_at_or_after).
+    """
+    f.seek(start)
+    position = start
+    pending = b""
+    while position < end:
+        block = f.read(min(chunk_size, end - position))
+        if not block:
+            break
+        position += len(block)
+        block = pending + block
+        if position < end:
+            # Keep the trailing partial word for the next chunk
+            cut = max(block.rfind(bytes([b])) for b in WHITESPACE_BYTES) + 1
+            block, pending = block[:cut], block[cut:]
+        else:
+            pending = b""
+        if block:
+            yield block.decode("utf-8", errors="replace"), position - len(pending)
+    if pending:
+        yield pending.decode("utf-8", errors="replace"), position
+
+
+def count_file(path, snapshot_path=None, resume=False, chunk_size=1 << 20,
+               checkpoint_bytes=64 << 20, alphabet=None):
+    """Count a file chunk by chunk, checkpointing to snapshot_path as it goes"""
+    size = os.path.getsize(path)
+    name = alphabet_name(alphabet)
+    if resume and snapshot_path and os.path.exists(snapshot_path):
+        snapshot = load_snapshot(snapshot_path)
+        if snapshot.merged:
+            raise SnapshotError(f"{snapshot_path} is a merged snapshot and cannot be resumed")
+        if snapshot.source_size != size or snapshot.offset > size:
+            raise SnapshotError(f"{snapshot_path} was taken from a {snapshot.source_size}-byte "
+                                f"input, but {path} is {size} bytes")
+        if snapshot.alphabet != name:
+            raise SnapshotError(f"{snapshot_path} was counted with alphabet "
+                                f"{snapshot.alphabet or '(default)'}, not {name or '(default)'}")
+    else:
+        snapshot = Snapshot(source_size=size, alphabet=name)
+    last_checkpoint = snapshot.offset
+    with open(path, "rb") as f:
+        for text, offset in read_chunks(f, snapshot.offset, size, chunk_size):
+            snapshot.update(count_letters(text, alphabet), count_words(text))
+            snapshot.offset = offset
+            if snapshot_path and offset - last_checkpoint >= checkpoint_bytes:
+                save_snapshot(snapshot, snapshot_path)
+                last_checkpoint = offset
+
+    if snapshot_path:
+        save_snapshot(snapshot, snapshot_path)
+    return snapshot
+
+
+def print_snapshot(snapshot, top_n=20):
+    """Print a short summary of a snapshot"""
+    if snapshot.merged:
+        print("Merged snapshot (not resumable)")
+    else:
+        print(f"Resume offset: {snapshot.offset} of {snapshot.source_size} bytes")
+    print(f"Alphabet: {snapshot.alphabet or '(default)'}")
+    print(f"Total letters: {sum(snapshot.letters.values())}")
+    print(f"Unique words: {len(snapshot.words)}")
+    print("\nLetter frequencies:")
+    for letter in sorted(snapshot.letters):
+        print(f"  '{letter}': {snapshot.letters[letter]}")
+    print(f"\nTop {top_n} words:")
+    for word, count in snapshot.words.most_common(top_n):
+        print(f"  '{word}': {count}")
+
+
+def main():
+    """Command line entry point: count, merge and show snapshots"""
+    parser = argparse.ArgumentParser(description="Letter/word count snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    count = commands.add_parser("count", help="count a file into a snapshot")
+    count.add_argument("input")
+    count.add_argument("-o", "--output", required=True, help="snapshot file")
+    count.add_argument("--resume", action="store_true",
+                       help="continue from the offset stored in --output")
+    count.add_argument("--chunk-size", type=int, default=1 << 20)
+    count.add_argument("--checkpoint-bytes", type=int, default=64 << 20,
+                       help="write a checkpoint after this many input bytes")
+    count.add_argument("--alphabet", help="alphabet profile for letter counts")
+
+    merge = commands.add_parser("merge", help="merge snapshots into one")
+    merge.add_argument("output")
+    merge.add_argument("inputs", nargs="+")
+
+    show = commands.add_parser("show", help="print a snapshot summary")
+    show.add_argument("snapshot")
+    show.add_argument("--top", type=int, default=20)
+
+    args = parser.parse_args()
+    try:
+        if args.command == "count":
+            count_file(args.input, args.output, args.resume, args.chunk_size,
+                       args.checkpoint_bytes, args.alphabet)
+        elif args.command == "merge":
+            merge_snapshots(args.inputs, args.output)
+        else:
+            print_snapshot(load_snapshot(args.snapshot), args.top)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,8 @@
 import matplotlib.pyplot as plt
 from collections import Counter
-
-def count_letters(text):
-    """Count how many times each letter appears in the text"""
-    letter_count = {}
-    
-    for char in text.lower():
-        if char.isalpha():
-            if char in letter_count:
-                letter_count[char] += 1
-            else:
-                letter_count[char] = 1
-    
-    return letter_count
+import argparse
+from alphabets import ALPHABETS
+from simple_analyzer import count_letters
 
 def count_words(text):
     """Count how many times each word appears in the text"""
@@ -43,6 +33,10 @@ def main():
     print("LETTER FREQUENCY ANALYZER")
     print("="*60)
     
+    parser = argparse.ArgumentParser(description="Letter frequency analyzer demo")
+    parser.add_argument("--alphabet", help=f"alphabet profile: {', '.join(ALPHABETS)}")
+    args = parser.parse_args()
+    
     # Get text from user
     print("Enter your text to analyze:")
     text = input("> ")
@@ -56,7 +50,10 @@ def main():
     print()
     
     # Count letters and words
-    letters = count_letters(text)
+    try:
+        letters = count_letters(text, args.alphabet)
+    except ValueError as e:
+        parser.error(str(e))
     words = count_words(text)
     
     # Show results
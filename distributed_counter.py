@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# Distributed letter and word counting over TCP - No external libraries needed
+#
+# A coordinator splits files into byte-range shards and hands them to workers
+# connecting over plain TCP. Each worker counts its shard with count_letters/
+# count_words and streams back a counter_snapshot encoding of the result,
+# which the coordinator merges as it arrives. Shards whose worker disconnects
+# are requeued; shards running longer than --shard-timeout are handed to a
+# second worker and the first result to arrive wins. A worker that cannot
+# count a shard reports an error instead of dying, and the run stops with an
+# error once one shard has failed --max-attempts times.
+#
+# Shard edges are moved to word boundaries (see boundary_at_or_after), so the
+# shards partition each file exactly and the totals match a single-process
+# counter_snapshot run.
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+from alphabets import get_alphabet
+from counter_snapshot import (FLAG_MERGED, Snapshot, SnapshotError, alphabet_name,
+                              boundary_at_or_after, decode_snapshot, encode_snapshot, print_snapshot,
+                              read_chunks, save_snapshot)
+from simple_analyzer import count_letters, count_words
+
+FRAME = struct.Struct("<BI")
+HELLO, TASK, RESULT, DONE, ERROR = 1, 2, 3, 4, 5
+SHARD_ID = struct.Struct("<I")
+
+
+class ShardError(RuntimeError):
+    """A shard failed on every attempt"""
+
+
+def send_frame(sock, kind, payload=b""):
+    """Send one length-prefixed message"""
+    sock.sendall(FRAME.pack(kind, len(payload)) + payload)
+
+
+def recv_exact(sock, size):
+    """Read exactly size bytes or raise ConnectionError"""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock):
+    """Receive one message as (kind, payload)"""
+    kind, size = FRAME.unpack(recv_exact(sock, FRAME.size))
+    return kind, recv_exact(sock, size)
+
+
+def make_shards(paths, shard_size):
+    """Split files into (path, start, end) byte ranges"""
+    shards = []
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, size, shard_size):
+            shards.append((path, start, min(start + shard_size, size)))
+    return shards
+
+
+def count_shard(path, start, end, alphabet=None):
+    """Count the words that begin inside f[start:end]"""
+    size = os.path.getsize(path)
+    snapshot = Snapshot(alphabet=alphabet_name(alphabet))
+    with open(path, "rb") as f:
+        start = boundary_at_or_after(f, start, size)
+        end = boundary_at_or_after(f, end, size)
+        for text, _ in read_chunks(f, start, end):
+            snapshot.update(count_letters(text, alphabet), count_words(text))
+    return snapshot
+
+
+class Coordinator:
+    """Shard bookkeeping shared by all worker connections"""
+
+    def __init__(self, shards, alphabet=None, shard_timeout=300, max_attempts=3):
+        self.shards = shards
+        self.alphabet = alphabet
+        self.shard_timeout = shard_timeout
+        self.max_attempts = max_attempts
+        self.pending = deque(range(len(shards)))
+        self.running = {}  # shard id -> deadline of its latest assignment
+        self.failures = {}  # shard id -> failed attempts so far
+        self.done = set()
+        self.error = None
+        self.totals = Snapshot(flags=FLAG_MERGED, alphabet=alphabet_name(alphabet))
+        self.condition = threading.Condition()
+
+    @property
+    def finished(self):
+        return len(self.done) == len(self.shards) or self.error is not None
+
+    def next_shard(self):
+        """Block until a shard is available, or return None when the run is over"""
+        with self.condition:
+            while not self.finished:
+                if self.pending:
+                    shard_id = self.pending.popleft()
+                    if shard_id in self.done:
+                        continue
+                    self.running[shard_id] = time.monotonic() + self.shard_timeout
+                    return shard_id
+                # Nothing queued: duplicate the most overdue straggler, if any
+                now = time.monotonic()
+                overdue = [s for s, deadline in self.running.items() if deadline < now]
+                if overdue:
+                    shard_id = min(overdue, key=self.running.get)
+                    self.running[shard_id] = now + self.shard_timeout
+                    return shard_id
+                self.condition.wait(timeout=1)
+            return None
+
+    def complete(self, shard_id, snapshot):
+        """Merge a shard result unless another worker already delivered it"""
+        with self.condition:
+            if shard_id in self.done:
+                return False
+            self.totals.update(snapshot.letters, snapshot.words)
+            self.done.add(shard_id)
+            self.running.pop(shard_id, None)
+            self.condition.notify_all()
+            return True
+
+    def fail(self, shard_id, reason="worker disconnected"):
+        """Requeue a shard whose worker failed, or stop after max_attempts"""
+        with self.condition:
+            if shard_id in self.done:
+                return
+            self.failures[shard_id] = self.failures.get(shard_id, 0) + 1
+            if self.failures[shard_id] >= self.max_attempts:
+                path, start, end = self.shards[shard_id]
+                self.error = (f"{path} bytes {start}-{end} failed "
+                              f"{self.failures[shard_id]} times: {reason}")
+            elif shard_id not in self.pending:
+                self.running.pop(shard_id, None)
+                self.pending.appendleft(shard_id)
+            self.condition.notify_all()
+
+
+class WorkerHandler(socketserver.BaseRequestHandler):
+    """Serve shards to one connected worker"""
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        sock = self.request
+        try:
+            kind, _ = recv_frame(sock)
+            if kind != HELLO:
+                return
+        except ConnectionError:
+            return
+
+        while True:
+            shard_id = coordinator.next_shard()
+            if shard_id is None:
+                try:
+                    send_frame(sock, DONE)
+                except OSError:
+                    pass
+                return
+            path, start, end = coordinator.shards[shard_id]
+            task = {'shard': shard_id, 'path': path, 'start': start, 'end': end,
+                    'alphabet': coordinator.alphabet}
+            try:
+                send_frame(sock, TASK, json.dumps(task).encode("utf-8"))
+                kind, payload = recv_frame(sock)
+                if kind not in (RESULT, ERROR):
+                    raise ConnectionError(f"unexpected message {kind}")
+                (result_id,) = SHARD_ID.unpack_from(payload)
+                if kind == ERROR:
+                    coordinator.fail(result_id, payload[SHARD_ID.size:].decode("utf-8"))
+                    continue
+                snapshot = decode_snapshot(payload[SHARD_ID.size:])
+            except (OSError, SnapshotError, struct.error):
+                coordinator.fail(shard_id)
+                return
+            coordinator.complete(result_id, snapshot)
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def run_coordinator(paths, host="127.0.0.1", port=5555, shard_size=64 << 20,
+                    alphabet=None, shard_timeout=300, ready=None, max_attempts=3):
+    """Serve shards until every one is counted and return the merged Snapshot
+
+    Raises ShardError when a shard fails max_attempts times.
+    """
+    # Catch bad input here rather than have every worker fail on it
+    if alphabet:
+        get_alphabet(alphabet)
+    for path in paths:
+        with open(path, "rb"):
+            pass
+    coordinator = Coordinator(make_shards(paths, shard_size), alphabet, shard_timeout,
+                              max_attempts)
+    with CoordinatorServer((host, port), WorkerHandler) as server:
+        server.coordinator = coordinator
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        if ready is not None:
+            ready(server.server_address)
+        with coordinator.condition:
+            while not coordinator.finished:
+                coordinator.condition.wait()
+        server.shutdown()
+    if coordinator.error is not None:
+        raise ShardError(coordinator.error)
+    return coordinator.totals
+
+
+def run_worker(host="127.0.0.1", port=5555, retries=30):
+    """Count shards for a coordinator until it reports that all are done"""
+    for attempt in range(retries):
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(1)
+
+    counted = 0
+    with sock:
+        send_frame(sock, HELLO, json.dumps({'pid': os.getpid()}).encode("utf-8"))
+        while True:
+            try:
+                kind, payload = recv_frame(sock)
+            except ConnectionError:
+                break
+            if kind == DONE:
+                break
+            task = json.loads(payload)
+            shard_id = SHARD_ID.pack(task['shard'])
+            try:
+                snapshot = count_shard(task['path'], task['start'], task['end'],
+                                       task['alphabet'])
+            except (OSError, ValueError) as e:
+                send_frame(sock, ERROR, shard_id + str(e).encode("utf-8"))
+                continue
+            send_frame(sock, RESULT, shard_id + encode_snapshot(snapshot))
+            counted += 1
+    return counted
+
+
+def main():
+    """Command line entry point: coordinator, worker, or both on localhost"""
+    parser = argparse.ArgumentParser(description="Distributed letter/word counting")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = commands.add_parser("coordinator", help="hand out shards and merge results")
+    local = commands.add_parser("local", help="coordinator plus worker processes on this machine")
+    for sub in (coordinator, local):
+        sub.add_argument("files", nargs="+")
+        sub.add_argument("-o", "--output", help="write the merged snapshot here")
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--port", type=int, default=5555)
+        sub.add_argument("--shard-size", type=int, default=64 << 20)
+        sub.add_argument("--shard-timeout", type=float, default=300,
+                         help="seconds before a slow shard is given to another worker")
+        sub.add_argument("--alphabet", help="alphabet profile for letter counts")
+        sub.add_argument("--max-attempts", type=int, default=3,
+                         help="failures of one shard before giving up")
+    local.add_argument("--workers", type=int, default=os.cpu_count())
+
+    worker = commands.add_parser("worker", help="count shards for a coordinator")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=5555)
+
+    args = parser.parse_args()
+    if args.command == "worker":
+        try:
+            counted = run_worker(args.host, args.port)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Worker {os.getpid()} counted {counted} shards")
+        return
+
+    processes = []
+
+    def start_workers(address):
+        if args.command == "local":
+            for _ in range(args.workers):
+                processes.append(subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), "worker",
+                     "--host", address[0], "--port", str(address[1])],
+                    stdout=subprocess.DEVNULL))
+
+    try:
+        totals = run_coordinator(args.files, args.host, args.port, args.shard_size,
+                                 args.alphabet, args.shard_timeout, start_workers,
+                                 args.max_attempts)
+    except (OSError, ValueError, ShardError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        for process in processes:
+            process.wait()
+
+    if args.output:
+        save_snapshot(totals, args.output)
+    print_snapshot(totals, top_n=10)
+
+
+if __name__ == "__main__":
+    main()
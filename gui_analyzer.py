@@ -5,6 +5,7 @@ from tkinter import ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from alphabets import ALPHABETS
 from simple_analyzer import count_letters, count_words
 
 class AnalyzerGUI:
@@ -32,9 +33,18 @@ class AnalyzerGUI:
         self.text_input = tk.Text(left_panel, height=6, width=40)
         self.text_input.grid(row=1, column=0, pady=(0, 10))
         
+        # Alphabet selection
+        alphabet_frame = ttk.Frame(left_panel)
+        alphabet_frame.grid(row=2, column=0, sticky=tk.W, pady=(0, 10))
+        ttk.Label(alphabet_frame, text="Alphabet:").pack(side=tk.LEFT, padx=(0, 5))
+        self.alphabet_var = tk.StringVar(value="all")
+        alphabet_box = ttk.Combobox(alphabet_frame, textvariable=self.alphabet_var,
+                                    values=["all"] + list(ALPHABETS), state="readonly", width=12)
+        alphabet_box.pack(side=tk.LEFT)
+        
         # Buttons
         button_frame = ttk.Frame(left_panel)
-        button_frame.grid(row=2, column=0, pady=(0, 20))
+        button_frame.grid(row=3, column=0, pady=(0, 20))
         
         generate_btn = ttk.Button(button_frame, text="Analyze & Plot", command=self.analyze_and_plot, style="Accent.TButton")
         generate_btn.pack(side=tk.LEFT, padx=(0, 10))
@@ -47,10 +57,10 @@ class AnalyzerGUI:
         
         # Statistics panel
         stats_label = ttk.Label(left_panel, text="Text Statistics:", font=("Arial", 12, "bold"))
-        stats_label.grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
+        stats_label.grid(row=4, column=0, sticky=tk.W, pady=(0, 5))
         
         self.stats_text = tk.Text(left_panel, height=8, width=40, font=("Courier", 10))
-        self.stats_text.grid(row=4, column=0, pady=(0, 10))
+        self.stats_text.grid(row=5, column=0, pady=(0, 10))
         
         # Right panel for charts
         right_panel = ttk.Frame(main_frame)
@@ -100,7 +110,8 @@ class AnalyzerGUI:
             return
         
         # Analyze text using functions from simple_analyzer.py
-        letters = count_letters(text)
+        alphabet = self.alphabet_var.get()
+        letters = count_letters(text, None if alphabet == "all" else alphabet)
         words = count_words(text)
         
         # Update statistics
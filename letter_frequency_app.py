@@ -6,17 +6,27 @@ import io
 import base64
 import numpy as np
 from collections import Counter
+import os
 import re
+import threading
+from alphabets import ALPHABETS, get_alphabet
+from language_profiles import METHODS, ProfileMatcher
+from serving import offload
+from simple_analyzer import count_alpha
+from word_index import WordIndex, WordIndexError
 
 app = Flask(__name__)
+app.config['WORD_INDEX_PATH'] = os.environ.get('WORD_INDEX_PATH', 'word_index.lfwi')
 
-def letter_frequency(text):
-    """Calculate letter frequency in text"""
-    freq = {}
-    for char in text.lower():
-        if char.isalpha():  # Only count letters
-            freq[char] = freq.get(char, 0) + 1
-    return freq
+_word_index = {'key': None, 'index': None}
+_word_index_lock = threading.Lock()
+language_matcher = ProfileMatcher()
+
+def letter_frequency(text, alphabet=None):
+    """Calculate letter frequency in text, optionally with an alphabet profile"""
+    if alphabet:
+        return get_alphabet(alphabet).count(text)
+    return count_alpha(text)
 
 def word_frequency(text):
     """Calculate word frequency in text"""
@@ -86,20 +96,23 @@ def calculate_statistics(freq):
     
     return stats
 
-@app.route('/')
-def index():
-    return render_template('index.html')
+def get_word_index():
+    """Open the configured word index, reopening it when the file changes"""
+    path = app.config['WORD_INDEX_PATH']
+    stat = os.stat(path)
+    key = (path, stat.st_ino, stat.st_mtime_ns)
+    with _word_index_lock:
+        if _word_index['key'] != key:
+            # The old index is not closed here: other requests may still be
+            # reading it, and its map is released once the last one drops it
+            _word_index['index'] = WordIndex(path)
+            _word_index['key'] = key
+        return _word_index['index']
 
-@app.route('/analyze', methods=['POST'])
-def analyze_text():
-    data = request.json
-    text = data.get('text', '')
-    
-    if not text.strip():
-        return jsonify({'error': 'Please enter some text to analyze'})
-    
+def analyze(text, alphabet=None):
+    """Compute frequencies, plots and statistics for the /analyze response"""
     # Calculate frequencies
-    letter_freq = letter_frequency(text)
+    letter_freq = letter_frequency(text, alphabet)
     word_freq = word_frequency(text)
     
     # Create plots
@@ -120,10 +133,106 @@ def analyze_text():
         'word_statistics': word_stats,
         'text_length': len(text),
         'word_count': len(text.split()),
-        'character_count': len([c for c in text if c.isalpha()])
+        'character_count': sum(letter_freq.values()),
+        'alphabet': alphabet or 'all'
     }
     
+    return response
+
+@app.route('/')
+def index():
+    return render_template('index.html')
+
+@app.route('/analyze', methods=['POST'])
+def analyze_text():
+    data = request.json
+    text = data.get('text', '')
+    alphabet = data.get('alphabet')
+    
+    if not text.strip():
+        return jsonify({'error': 'Please enter some text to analyze'})
+    if alphabet and (not isinstance(alphabet, str) or alphabet not in ALPHABETS):
+        return jsonify({'error': f"Unknown alphabet '{alphabet}'"})
+    
+    # Counting and plotting are CPU-bound; in serving mode they run in the
+    # process pool (pyplot is not thread-safe either)
+    response = offload(analyze, text, alphabet)
+    
+    return jsonify(response)
+
+@app.route('/index/query', methods=['POST'])
+def query_word_index():
+    data = request.json
+    query = data.get('query', 'tf')
+    term = data.get('term', '').strip()
+    docs = data.get('docs')  # None means every indexed document
+    if docs is not None and (not isinstance(docs, list)
+                             or not all(isinstance(d, str) for d in docs)):
+        return jsonify({'error': 'docs must be a list of document names'})
+    try:
+        n = int(data.get('n', 10))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'n must be a whole number'})
+    if n < 1:
+        return jsonify({'error': 'n must be at least 1'})
+    
+    try:
+        word_index = get_word_index()
+        if query == 'tf':
+            if not term:
+                return jsonify({'error': 'Please provide a term'})
+            response = {
+                'term': term,
+                'term_frequency': word_index.term_frequency(term, docs),
+                'document_frequency': word_index.document_frequency(term)
+            }
+        elif query == 'top_terms':
+            top = word_index.top_terms(docs, n)
+            response = {'top_terms': [{'term': t, 'count': c} for t, c in top]}
+        elif query == 'tfidf':
+            if not term:
+                return jsonify({'error': 'Please provide a term'})
+            scores = word_index.tf_idf(term, docs)
+            response = {
+                'term': term,
+                'idf': word_index.idf(term),
+                'tfidf': [{'document': d, 'score': s} for d, s in scores]
+            }
+        else:
+            return jsonify({'error': f"Unknown query type '{query}'"})
+    except OSError:
+        return jsonify({'error': 'Word index not found, build it with word_index.py'})
+    except WordIndexError as e:
+        return jsonify({'error': str(e)})
+    
     return jsonify(response)
 
+def classify_texts(texts, method):
+    """Classify a batch with the module-level matcher (picklable for offload)"""
+    return language_matcher.classify(texts, method)
+
+@app.route('/api/classify_language', methods=['POST'])
+def classify_language():
+    data = request.json
+    texts = data.get('texts')
+    if texts is None:
+        texts = [data.get('text', '')]
+        if not isinstance(texts[0], str):
+            return jsonify({'error': 'text must be a string'})
+    method = data.get('method', 'chi_square')
+    
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return jsonify({'error': 'texts must be a list of strings'})
+    if method not in METHODS:
+        return jsonify({'error': f"Unknown method '{method}'"})
+    if not any(t.strip() for t in texts):
+        return jsonify({'error': 'Please enter some text to classify'})
+    
+    return jsonify({
+        'method': method,
+        'languages': language_matcher.languages,
+        'results': offload(classify_texts, texts, method)
+    })
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# Local load test for the web apps - No external libraries needed
+#
+# Sends the same POST request from 1, 8 and 64 concurrent clients and reports
+# throughput and latency percentiles for each level. Start the server first:
+#
+#   python serving.py letter_frequency_app --port 8000
+#   python load_test.py --url http://127.0.0.1:8000/analyze
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PAYLOAD = {
+    'text': "The quick brown fox jumps over the lazy dog. " * 20
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_level(url, body, clients, duration, timeout=30):
+    """Hammer url from `clients` threads for `duration` seconds"""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        while time.perf_counter() < deadline:
+            request = urllib.request.Request(
+                url, data=body, headers={'Content-Type': 'application/json'})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            except (urllib.error.URLError, OSError):
+                status = 'error'
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for _ in range(clients):
+            pool.submit(client)
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'clients': clients,
+        'requests': sum(statuses.values()),
+        'ok': len(latencies),
+        'throughput': len(latencies) / wall,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'statuses': statuses,
+    }
+
+
+def main():
+    """Run each concurrency level and print a summary table"""
+    parser = argparse.ArgumentParser(description="Load test a local server")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/analyze")
+    parser.add_argument("--payload", help="JSON request body (default: sample text)")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 64],
+                        help="numbers of concurrent clients")
+    parser.add_argument("--duration", type=float, default=10,
+                        help="seconds per level")
+    args = parser.parse_args()
+
+    body = (args.payload or json.dumps(DEFAULT_PAYLOAD)).encode('utf-8')
+    print(f"Load testing {args.url} for {args.duration:g}s per level")
+    print(f"{'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    for clients in args.levels:
+        result = run_level(args.url, body, clients, args.duration)
+        statuses = ", ".join(f"{k}: {v}" for k, v in sorted(result['statuses'].items(), key=str))
+        print(f"{clients:>8} {result['throughput']:>9.1f} {result['p50_ms']:>9.1f} "
+              f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f}  {statuses}")
+
+
+if __name__ == "__main__":
+    main()
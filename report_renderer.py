@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# Buffered report rendering for letter/word counts - No external libraries needed
+#
+# Reports are built as one string and written with a single call instead of
+# one print() per row, and --top N picks rows with heapq.nlargest instead of
+# sorting the whole vocabulary. Besides the text report, counts can be
+# rendered as CSV, JSON or NDJSON for piping into other tools.
+
+import argparse
+import csv
+import heapq
+import io
+import json
+import os
+import sys
+import time
+from operator import itemgetter
+
+FORMATS = ('text', 'csv', 'json', 'ndjson')
+
+
+def select_rows(data, top_n=None):
+    """(item, count) rows: the top_n most frequent, or all sorted by item"""
+    if top_n is None:
+        return sorted(data.items())
+    return heapq.nlargest(top_n, data.items(), key=itemgetter(1))
+
+
+def render_chart(data, title, max_width=50, top_n=None):
+    """ASCII bar chart as a string (empty when there is no data)"""
+    rows = select_rows(data, top_n)
+    if not rows:
+        return ""
+    # Scale to the largest count overall, so top-N bars match the full chart
+    max_val = rows[0][1] if top_n is not None else max(data.values())
+    lines = ["", title, "-" * len(title)]
+    for item, count in rows:
+        bar_length = int((count / max_val) * max_width) if max_val > 0 else 0
+        lines.append(f"{item:2} | {'#' * bar_length} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _section(title, data, top_n):
+    """Frequency listing, noting when only the top rows are shown"""
+    lines = ["", title]
+    if top_n is not None and len(data) > top_n:
+        lines[-1] = f"{title[:-1]} (top {top_n} of {len(data)}):"
+    lines.extend(f"  '{item}': {count}" for item, count in select_rows(data, top_n))
+    return lines
+
+
+def render_text_report(text, letters, words, top_n=None, preview=None):
+    """The print_results report as a single string
+
+    top_n limits the listings and charts to the most frequent rows; preview
+    truncates the echoed text to that many characters.
+    """
+    shown = text if preview is None or len(text) <= preview else text[:preview] + "..."
+    lines = [
+        "=" * 50,
+        "LETTER FREQUENCY ANALYSIS",
+        "=" * 50,
+        f"Text: '{shown}'",
+        f"Total characters: {len(text)}",
+        f"Total words: {sum(words.values())}",
+        f"Total letters: {sum(letters.values())}",
+        f"Unique letters: {len(letters)}",
+    ]
+    lines += _section("Letter frequencies:", letters, top_n)
+    lines += _section("Word frequencies:", words, top_n)
+    if letters:
+        most_common = max(letters, key=letters.get)
+        lines += ["", f"Most common letter: '{most_common}' ({letters[most_common]} times)"]
+    report = "\n".join(lines) + "\n"
+    report += render_chart(letters, "LETTER FREQUENCY CHART", top_n=top_n)
+    report += render_chart(words, "WORD FREQUENCY CHART", top_n=top_n)
+    return report
+
+
+def render_records(letters, words, fmt, top_n=None):
+    """Counts as CSV, JSON or NDJSON"""
+    rows = [('letter', item, count) for item, count in select_rows(letters, top_n)]
+    rows += [('word', item, count) for item, count in select_rows(words, top_n)]
+    if fmt == 'csv':
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(('type', 'item', 'count'))
+        writer.writerows(rows)
+        return out.getvalue()
+    if fmt == 'ndjson':
+        return "".join(json.dumps({'type': kind, 'item': item, 'count': count},
+                                  ensure_ascii=False) + "\n"
+                       for kind, item, count in rows)
+    if fmt == 'json':
+        return json.dumps({
+            'total_letters': sum(letters.values()),
+            'total_words': sum(words.values()),
+            'unique_letters': len(letters),
+            'unique_words': len(words),
+            'letters': [{'item': i, 'count': c} for k, i, c in rows if k == 'letter'],
+            'words': [{'item': i, 'count': c} for k, i, c in rows if k == 'word'],
+        }, ensure_ascii=False) + "\n"
+    raise ValueError(f"unknown format '{fmt}', expected one of {', '.join(FORMATS)}")
+
+
+def write_report(report, stream=None):
+    """Write a rendered report in one call"""
+    stream = stream or sys.stdout
+    stream.write(report)
+    stream.flush()
+
+
+def _legacy_render(letters, words, stream):
+    """The old one-print-per-row output, kept only for the benchmark"""
+    for letter in sorted(letters.keys()):
+        print(f"  '{letter}': {letters[letter]}", file=stream)
+    for word in sorted(words.keys()):
+        print(f"  '{word}': {words[word]}", file=stream)
+    for data in (letters, words):
+        max_val = max(data.values())
+        for item in sorted(data.keys()):
+            count = data[item]
+            bar = "#" * int((count / max_val) * 50)
+            print(f"{item:2} | {bar} {count}", file=stream)
+
+
+def benchmark(vocabulary=1000000, top_n=20, seed=0):
+    """Seconds to render a report for a vocabulary of the given size"""
+    import random
+    rng = random.Random(seed)
+    words = {f"word{i}": rng.randint(1, 1000) for i in range(vocabulary)}
+    letters = {chr(ord('a') + i): rng.randint(1, 10**6) for i in range(26)}
+    timings = {}
+    # Line-buffered like a terminal, so each print() is its own write
+    with open(os.devnull, "w", buffering=1) as devnull:
+        start = time.perf_counter()
+        _legacy_render(letters, words, devnull)
+        timings['print per row, full sort'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_report(render_text_report("", letters, words), devnull)
+        timings['buffered, full sort'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_report(render_text_report("", letters, words, top_n=top_n), devnull)
+        timings[f'buffered, top {top_n} heap'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_report(render_records(letters, words, 'ndjson', top_n=top_n), devnull)
+        timings[f'ndjson, top {top_n} heap'] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    """Analyze a file (or stdin) and render the report"""
+    from simple_analyzer import count_letters, count_words
+
+    parser = argparse.ArgumentParser(description="Render letter/word frequency reports")
+    parser.add_argument("input", nargs="?", help="text file (default: stdin)")
+    parser.add_argument("--top", type=int, help="only show the N most frequent rows")
+    parser.add_argument("--format", choices=FORMATS, default='text')
+    parser.add_argument("--alphabet", help="alphabet profile for letter counts")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time rendering a 1M-word vocabulary")
+    args = parser.parse_args()
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+
+    if args.benchmark:
+        for label, seconds in benchmark().items():
+            print(f"{label:28} {seconds:8.3f}s")
+        return
+
+    if args.input:
+        with open(args.input, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    else:
+        text = sys.stdin.read()
+    try:
+        letters = count_letters(text, args.alphabet)
+    except ValueError as e:
+        parser.error(str(e))
+    words = count_words(text)
+
+    if args.format == 'text':
+        report = render_text_report(text, letters, words, args.top, preview=50)
+    else:
+        report = render_records(letters, words, args.format, args.top)
+    try:
+        write_report(report)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); nothing left to do
+        sys.stderr.close()
+
+
+if __name__ == "__main__":
+    main()
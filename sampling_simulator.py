@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# Monte Carlo sampling distributions for the distributions page
+#
+# Draws (repetitions x sample size) matrices in blocks small enough to stay
+# within --block-mb, reduces each row to a statistic (mean, variance or
+# t-statistic) and accumulates a fixed-edge histogram, so memory does not
+# grow with the number of repetitions. Blocks run in a process pool when
+# more than one worker is available.
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.stats as stats
+
+DISTRIBUTIONS = ('normal', 'exponential', 'binomial')
+STATISTICS = ('mean', 'variance', 't')
+PARAMETERS = {'normal': ('mean', 'std'), 'exponential': ('lambda',), 'binomial': ('n', 'p')}
+
+
+def check_params(dist_type, params):
+    """Validated numeric copy of the population parameters
+
+    Raises ValueError for missing or non-finite values and for populations
+    without spread (std or lambda not positive, binomial n < 1 or p at 0 or 1).
+    """
+    names = PARAMETERS[dist_type]
+    try:
+        values = {name: float(params[name]) for name in names}
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"{dist_type} needs numeric parameters {', '.join(names)}") from None
+    if not all(math.isfinite(v) for v in values.values()):
+        raise ValueError("parameters must be finite numbers")
+    if dist_type == 'normal' and values['std'] <= 0:
+        raise ValueError("normal std must be positive")
+    if dist_type == 'exponential' and values['lambda'] <= 0:
+        raise ValueError("exponential lambda must be positive")
+    if dist_type == 'binomial':
+        if values['n'] < 1 or not values['n'].is_integer():
+            raise ValueError("binomial n must be a whole number of at least 1")
+        values['n'] = int(values['n'])
+        if not 0 < values['p'] < 1:
+            # p = 0 or 1 gives constant samples, with no spread to histogram
+            raise ValueError("binomial p must be strictly between 0 and 1")
+    return values
+
+
+def _finite(value):
+    """value as a float, or None for NaN and infinities (which JSON cannot hold)"""
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def population_moments(dist_type, params):
+    """Mean, variance and fourth central moment of the population
+
+    'lambda' is the exponential rate, matching the pdf drawn by
+    /api/generate_distribution.
+    """
+    if dist_type == 'normal':
+        variance = params['std'] ** 2
+        return params['mean'], variance, 3 * variance ** 2
+    if dist_type == 'exponential':
+        rate = params['lambda']
+        return 1 / rate, 1 / rate ** 2, 9 / rate ** 4
+    if dist_type == 'binomial':
+        n, p = params['n'], params['p']
+        variance = n * p * (1 - p)
+        return n * p, variance, variance * (1 + 3 * (n - 2) * p * (1 - p))
+    raise ValueError(f"unknown distribution '{dist_type}'")
+
+
+def theoretical_distribution(dist_type, params, statistic, sample_size):
+    """Frozen scipy distribution of the statistic and a label saying how exact it is"""
+    mean, variance, fourth = population_moments(dist_type, params)
+    m = sample_size
+    if statistic == 'mean':
+        if dist_type == 'normal':
+            return stats.norm(mean, np.sqrt(variance / m)), 'exact: normal'
+        if dist_type == 'exponential':
+            return stats.gamma(m, scale=mean / m), 'exact: gamma'
+        return stats.norm(mean, np.sqrt(variance / m)), 'normal approximation (CLT)'
+    if statistic == 'variance':
+        if dist_type == 'normal':
+            return stats.chi2(m - 1, scale=variance / (m - 1)), 'exact: scaled chi-square'
+        spread = (fourth - variance ** 2 * (m - 3) / (m - 1)) / m
+        return stats.norm(variance, np.sqrt(spread)), 'normal approximation'
+    if statistic == 't':
+        label = 'exact: t' if dist_type == 'normal' else 't reference (exact only for normal data)'
+        return stats.t(m - 1), label
+    raise ValueError(f"unknown statistic '{statistic}'")
+
+
+def _draw(dist_type, params, rng, shape):
+    """Draw a matrix of samples from the population"""
+    if dist_type == 'normal':
+        return rng.normal(params['mean'], params['std'], shape)
+    if dist_type == 'exponential':
+        return rng.exponential(1 / params['lambda'], shape)
+    return rng.binomial(params['n'], params['p'], shape).astype(float)
+
+
+def _simulate_block(dist_type, params, statistic, sample_size, repetitions, seed, edges):
+    """Histogram counts and moments of the statistic for one block of repetitions"""
+    rng = np.random.default_rng(seed)
+    samples = _draw(dist_type, params, rng, (repetitions, sample_size))
+    means = samples.mean(axis=1)
+    if statistic == 'mean':
+        values = means
+    else:
+        variances = samples.var(axis=1, ddof=1)
+        if statistic == 'variance':
+            values = variances
+        else:
+            mu = population_moments(dist_type, params)[0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = (means - mu) / np.sqrt(variances / sample_size)
+            # Constant samples (possible for binomial) have no t-statistic
+            values = values[np.isfinite(values)]
+    counts, _ = np.histogram(values, bins=edges)
+    return {
+        'counts': counts,
+        'below': int((values < edges[0]).sum()),
+        'above': int((values > edges[-1]).sum()),
+        'n': len(values),
+        'sum': float(values.sum()),
+        'sum_sq': float((values ** 2).sum()),
+        'min': float(values.min()) if len(values) else np.inf,
+        'max': float(values.max()) if len(values) else -np.inf,
+    }
+
+
+def simulate(dist_type, params, statistic='mean', sample_size=30, repetitions=10**6,
+             bins=60, block_mb=64, workers=None, seed=None, executor=None):
+    """Sampling distribution of a statistic over many repeated samples
+
+    Blocks go to `executor` when given, else to a new process pool of
+    `workers` processes (default: CPU count; 1 runs everything inline).
+    """
+    if dist_type not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution '{dist_type}'")
+    if statistic not in STATISTICS:
+        raise ValueError(f"unknown statistic '{statistic}'")
+    if sample_size < 2 or repetitions < 1:
+        raise ValueError("sample_size must be at least 2 and repetitions at least 1")
+    if 8 * sample_size > block_mb << 20:
+        raise ValueError(f"a sample of {sample_size} values does not fit in {block_mb} MB")
+    if bins < 1:
+        raise ValueError("bins must be at least 1")
+    params = check_params(dist_type, params)
+
+    theory, label = theoretical_distribution(dist_type, params, statistic, sample_size)
+    low, high = theory.ppf([0.0005, 0.9995])
+    margin = (high - low) * 0.1
+    edges = np.linspace(low - margin, high + margin, bins + 1)
+
+    block_reps = max(1, (block_mb << 20) // (8 * sample_size))
+    sizes = [block_reps] * (repetitions // block_reps)
+    if repetitions % block_reps:
+        sizes.append(repetitions % block_reps)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(dist_type, params, statistic, sample_size, size, s, edges)
+            for size, s in zip(sizes, seeds)]
+
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if executor is not None:
+        results = [f.result() for f in [executor.submit(_simulate_block, *job) for job in jobs]]
+    elif workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(_simulate_block, *zip(*jobs)))
+    else:
+        results = [_simulate_block(*job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    counts = sum(r['counts'] for r in results)
+    total = sum(r['n'] for r in results)
+    mean = sum(r['sum'] for r in results) / total if total else None
+    mean_sq = sum(r['sum_sq'] for r in results) / total if total else None
+    widths = np.diff(edges)
+    curve_x = np.linspace(edges[0], edges[-1], 200)
+    return {
+        'distribution': dist_type,
+        'statistic': statistic,
+        'sample_size': sample_size,
+        'repetitions': repetitions,
+        'bin_edges': edges.tolist(),
+        'density': (counts / (max(total, 1) * widths)).tolist(),
+        'outside': {'below': sum(r['below'] for r in results),
+                    'above': sum(r['above'] for r in results)},
+        'theoretical': {'x': curve_x.tolist(), 'pdf': theory.pdf(curve_x).tolist(),
+                        'label': label, 'mean': _finite(theory.mean()),
+                        'std': _finite(theory.std())},
+        'summary': {'mean': mean,
+                    'std': None if total == 0 else math.sqrt(max(mean_sq - mean ** 2, 0)),
+                    'min': _finite(min(r['min'] for r in results)),
+                    'max': _finite(max(r['max'] for r in results)), 'count': total},
+        'blocks': len(jobs),
+        'elapsed': elapsed,
+    }
+
+
+def main():
+    """Run a simulation from the command line and print a summary"""
+    parser = argparse.ArgumentParser(description="Sampling distribution simulator")
+    parser.add_argument("distribution", choices=DISTRIBUTIONS)
+    parser.add_argument("--statistic", choices=STATISTICS, default='mean')
+    parser.add_argument("--sample-size", type=int, default=30)
+    parser.add_argument("--repetitions", type=int, default=10**6)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--block-mb", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--mean", type=float, default=0)
+    parser.add_argument("--std", type=float, default=1)
+    parser.add_argument("--lambda", dest="rate", type=float, default=1)
+    parser.add_argument("-n", type=int, default=20)
+    parser.add_argument("-p", type=float, default=0.5)
+    args = parser.parse_args()
+
+    params = {'mean': args.mean, 'std': args.std, 'lambda': args.rate,
+              'n': args.n, 'p': args.p}
+    try:
+        result = simulate(args.distribution, params, args.statistic, args.sample_size,
+                          args.repetitions, block_mb=args.block_mb, workers=args.workers,
+                          seed=args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    summary = result['summary']
+    theory = result['theoretical']
+    print(f"{args.repetitions:,} samples of size {args.sample_size} "
+          f"in {result['elapsed']:.2f}s ({result['blocks']} blocks)")
+    fmt = lambda value: "undefined" if value is None else f"{value:.5f}"
+    print(f"Simulated {args.statistic}: mean {fmt(summary['mean'])}, std {fmt(summary['std'])}")
+    print(f"Theoretical ({theory['label']}): mean {fmt(theory['mean'])}, "
+          f"std {fmt(theory['std'])}")
+    print(f"Outside histogram range: {result['outside']}")
+
+
+if __name__ == "__main__":
+    main()
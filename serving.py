@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# Production serving mode for app.py and letter_frequency_app.py
+#
+# `app.run(debug=True)` is a single-threaded development server: one slow
+# plot blocks every other client. This runs the same Flask app under a
+# multi-threaded WSGI server (waitress when installed) and sends CPU-bound
+# work to a shared process pool, so request threads only wait on results.
+# Requests beyond --max-concurrency are rejected with 503 instead of queuing.
+#
+# Pool workers are started through a fork server rather than forked from the
+# threaded server process, and a pool broken by a dead worker is replaced.
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import g, jsonify
+
+# Forking a process that runs request threads can copy locks mid-use
+START_METHOD = ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn")
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def _reseed_worker():
+    """Give each worker its own random state instead of a copy of its parent's"""
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    np.random.seed()
+
+
+def _new_pool(workers):
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                               mp_context=multiprocessing.get_context(START_METHOD),
+                               initializer=_reseed_worker)
+
+
+def init_pool(workers=None):
+    """Start the shared process pool used by offload()"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = workers
+            _pool = _new_pool(workers)
+        return _pool
+
+
+def restart_pool(broken):
+    """Replace a pool broken by a dead worker, unless another thread already did"""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            _pool = _new_pool(_pool_workers)
+        return _pool
+
+
+def get_pool():
+    """The shared process pool, or None outside serving mode"""
+    return _pool
+
+
+def shutdown_pool():
+    """Stop the shared process pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def offload(func, *args, **kwargs):
+    """Run func in the process pool if serving mode started one, else inline
+
+    func and its arguments must be picklable (module-level functions), which
+    keeps the development server (`python app.py`) working unchanged. If a
+    worker dies the request fails with 503 (see install_error_handlers), and
+    later ones get a fresh pool.
+    """
+    pool = _pool
+    if pool is None:
+        return func(*args, **kwargs)
+    try:
+        return pool.submit(func, *args, **kwargs).result()
+    except BrokenProcessPool:
+        restart_pool(pool)
+        raise
+
+
+def _retry_later(message):
+    """JSON 503 response asking the client to retry"""
+    response = jsonify({'error': message})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+def install_concurrency_limit(app, limit):
+    """Answer with 503 once `limit` requests are already in flight"""
+    slots = threading.BoundedSemaphore(limit)
+
+    @app.before_request
+    def _acquire_slot():
+        if not slots.acquire(blocking=False):
+            return _retry_later('Server is busy, please retry shortly')
+        g.holds_slot = True
+
+    @app.teardown_request
+    def _release_slot(exc):
+        if g.pop('holds_slot', False):
+            slots.release()
+
+
+def install_error_handlers(app):
+    """Answer with 503 when a pool worker died, for every offloaded route"""
+
+    @app.errorhandler(BrokenProcessPool)
+    def _worker_crashed(exc):
+        return _retry_later('A worker process crashed, please retry')
+
+
+def serve(app, host='127.0.0.1', port=8000, threads=64, workers=None,
+          max_concurrency=64):
+    """Run a Flask app in serving mode until interrupted"""
+    install_concurrency_limit(app, max_concurrency)
+    install_error_handlers(app)
+    init_pool(workers)
+    try:
+        try:
+            from waitress import serve as waitress_serve
+        except ImportError:
+            waitress_serve = None
+        if waitress_serve is not None:
+            print(f"Serving on http://{host}:{port} with waitress ({threads} threads)")
+            waitress_serve(app, host=host, port=port, threads=threads,
+                           connection_limit=max(threads, max_concurrency) * 2)
+        else:
+            from werkzeug.serving import run_simple
+            print(f"waitress not installed, using werkzeug's threaded server "
+                  f"on http://{host}:{port}")
+            run_simple(host, port, app, threaded=True)
+    finally:
+        shutdown_pool()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Serve a Flask app for production use")
+    parser.add_argument("module", nargs="?", default="letter_frequency_app",
+                        help="module holding the Flask `app` (app or letter_frequency_app)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--threads", type=int, default=64,
+                        help="request handling threads")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for CPU-bound work (default: CPU count)")
+    parser.add_argument("--max-concurrency", type=int, default=64,
+                        help="requests in flight before answering 503")
+    args = parser.parse_args()
+
+    app = importlib.import_module(args.module).app
+    serve(app, args.host, args.port, args.threads, args.workers, args.max_concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 # Simple Letter Frequency Analyzer - No external libraries needed
+import argparse
+from collections import Counter
 
-def count_letters(text):
-    """Count frequency of each letter in text"""
-    freq = {}
-    for char in text.lower():
-        if char.isalpha():  # Only count letters a-z
-            freq[char] = freq.get(char, 0) + 1
-    return freq
+from alphabets import ALPHABETS, get_alphabet
+from report_renderer import render_chart, render_text_report, write_report
+
+def count_alpha(text):
+    """Count every letter (anything isalpha()) of text, lowercased"""
+    counts = Counter(text.lower())
+    return {char: counts[char] for char in sorted(counts) if char.isalpha()}
+
+def count_letters(text, alphabet=None):
+    """Count frequency of each letter in text
+
+    alphabet is a profile name from alphabets.ALPHABETS (e.g. 'latin' folds
+    accents onto a-z) or a string of letters; None counts every letter.
+    """
+    if alphabet is not None:
+        return get_alphabet(alphabet).count(text)
+    return count_alpha(text)
 
 def count_words(text):
     """Count frequency of each word in text"""
@@ -17,56 +29,27 @@ def count_words(text):
         freq[word] = freq.get(word, 0) + 1
     return freq
 
-def create_ascii_chart(data, title, max_width=50):
+def create_ascii_chart(data, title, max_width=50, top_n=None):
     """Create simple ASCII bar chart"""
     if not data:
         return "No data to chart"
     
-    print(f"\n{title}")
-    print("-" * len(title))
-    
-    # Find maximum value for scaling
-    max_val = max(data.values())
-    
-    for item in sorted(data.keys()):
-        count = data[item]
-        # Create bar using # characters, scaled to max_width
-        bar_length = int((count / max_val) * max_width) if max_val > 0 else 0
-        bar = "#" * bar_length
-        print(f"{item:2} | {bar} {count}")
+    # Build the whole chart first and write it once
+    write_report(render_chart(data, title, max_width, top_n))
 
-def print_results(text, letters, words):
-    """Display analysis results"""
-    print("=" * 50)
-    print("LETTER FREQUENCY ANALYSIS")
-    print("=" * 50)
-    print(f"Text: '{text}'")
-    print(f"Total characters: {len(text)}")
-    print(f"Total words: {len(text.split())}")
-    print(f"Total letters: {sum(letters.values())}")
-    print(f"Unique letters: {len(letters)}")
-    
-    # Show letter counts
-    print("\nLetter frequencies:")
-    for letter in sorted(letters.keys()):
-        print(f"  '{letter}': {letters[letter]}")
-    
-    # Show word counts
-    print("\nWord frequencies:")
-    for word in sorted(words.keys()):
-        print(f"  '{word}': {words[word]}")
-    
-    # Find most common letter
-    if letters:
-        most_common = max(letters, key=letters.get)
-        print(f"\nMost common letter: '{most_common}' ({letters[most_common]} times)")
-    
-    # Create ASCII charts
-    create_ascii_chart(letters, "LETTER FREQUENCY CHART")
-    create_ascii_chart(words, "WORD FREQUENCY CHART")
+def print_results(text, letters, words, top_n=None):
+    """Display analysis results (top_n limits listings to the most frequent)"""
+    write_report(render_text_report(text, letters, words, top_n))
 
 def main():
     """Main program - get input and analyze"""
+    parser = argparse.ArgumentParser(description="Simple letter frequency analyzer")
+    parser.add_argument("--alphabet", help=f"alphabet profile: {', '.join(ALPHABETS)}")
+    parser.add_argument("--top", type=int, help="only show the N most frequent letters/words")
+    args = parser.parse_args()
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    
     print("Enter text to analyze (or press Enter for sample):")
     text = input("> ").strip()
     
@@ -75,11 +58,14 @@ def main():
         print(f"Using sample: '{text}'")
     
     # Analyze the text
-    letters = count_letters(text)
+    try:
+        letters = count_letters(text, args.alphabet)
+    except ValueError as e:
+        parser.error(str(e))
     words = count_words(text)
     
     # Show results
-    print_results(text, letters, words)
+    print_results(text, letters, words, args.top)
 
 if __name__ == "__main__":
     main()
@@ -1,19 +1,8 @@
 import matplotlib.pyplot as plt
 from collections import Counter
-import sys
-
-def count_letters(text):
-    """Count how many times each letter appears in the text"""
-    letter_count = {}
-    
-    for char in text.lower():
-        if char.isalpha():
-            if char in letter_count:
-                letter_count[char] += 1
-            else:
-                letter_count[char] = 1
-    
-    return letter_count
+import argparse
+from alphabets import ALPHABETS
+from simple_analyzer import count_letters
 
 def count_words(text):
     """Count how many times each word appears in the text"""
@@ -44,10 +33,22 @@ def main():
     print("LETTER FREQUENCY ANALYZER")
     print("="*60)
     
+    parser = argparse.ArgumentParser(
+        description="Letter frequency analyzer",
+        usage="%(prog)s [-h] [--alphabet ALPHABET] [text ...]",
+        epilog="Words that are not options are analyzed as text, even ones starting "
+               "with '-'; put -- before text starting with -h.",
+        allow_abbrev=False)
+    parser.add_argument("--alphabet", help=f"alphabet profile: {', '.join(ALPHABETS)}")
+    # Leftover arguments keep their order, so "-5 degrees" still reads as text
+    args, words = parser.parse_known_args()
+    if "--" in words:
+        words.remove("--")
+    
     # Check if text was provided as command line argument
-    if len(sys.argv) > 1:
+    if words:
         # Join all arguments after the script name
-        text = " ".join(sys.argv[1:])
+        text = " ".join(words)
         print(f"Analyzing text from command line: '{text}'")
     else:
         # Get text from user input
@@ -63,7 +64,10 @@ def main():
     print()
     
     # Count letters and words
-    letters = count_letters(text)
+    try:
+        letters = count_letters(text, args.alphabet)
+    except ValueError as e:
+        parser.error(str(e))
     words = count_words(text)
     
     # Show results
@@ -1,20 +1,8 @@
 import matplotlib.pyplot as plt
 from collections import Counter
-
-def count_letters(text):
-    """Count how many times each letter appears in the text"""
-    letter_count = {}
-    
-    # Go through each character in the text
-    for char in text.lower():
-        # Only count letters (a-z)
-        if char.isalpha():
-            if char in letter_count:
-                letter_count[char] += 1
-            else:
-                letter_count[char] = 1
-    
-    return letter_count
+import argparse
+from alphabets import ALPHABETS
+from simple_analyzer import count_letters
 
 def count_words(text):
     """Count how many times each word appears in the text"""
@@ -91,6 +79,10 @@ def main():
     print("Welcome to Simple Letter Frequency Analyzer!")
     print("This program counts letters and words in your text.")
     
+    parser = argparse.ArgumentParser(description="Simple letter frequency analyzer")
+    parser.add_argument("--alphabet", help=f"alphabet profile: {', '.join(ALPHABETS)}")
+    args = parser.parse_args()
+    
     # Get text from user
     print("\nEnter your text (or press Enter to use sample text):")
     user_text = input()
@@ -104,7 +96,10 @@ def main():
     print("\nAnalyzing your text...")
     
     # Count letters and words
-    letters = count_letters(user_text)
+    try:
+        letters = count_letters(user_text, args.alphabet)
+    except ValueError as e:
+        parser.error(str(e))
     words = count_words(user_text)
     
     # Show results
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# Sliding-window letter and word frequencies for streams - No external libraries needed
+#
+# Lines are grouped into buckets of `slide` lines (or seconds). A window is the
+# last window/slide buckets; when a bucket arrives its counts are added to the
+# window and the bucket that fell out is subtracted, so nothing is recounted.
+# One NDJSON record is written per window, with the Jensen-Shannon divergence
+# between its letter distribution and the previous window's.
+
+import argparse
+import heapq
+import json
+import math
+import sys
+from collections import Counter, deque
+from datetime import datetime
+from operator import itemgetter
+
+from alphabets import get_alphabet
+from simple_analyzer import count_alpha
+
+# Epoch seconds accepted as timestamps: 2000-01-01 up to 2100-01-01 UTC
+TIMESTAMP_RANGE = (946684800.0, 4102444800.0)
+
+
+def count_bucket(lines, alphabet=None):
+    """Count letters and words of a bucket of lines like count_letters/count_words"""
+    text = "".join(lines).lower()
+    if alphabet is not None:
+        return Counter(alphabet.count(text)), Counter(text.split())
+    return Counter(count_alpha(text)), Counter(text.split())
+
+
+def js_divergence(p, q):
+    """Jensen-Shannon divergence (base 2, between 0 and 1) of two count dicts"""
+    p_total = sum(p.values())
+    q_total = sum(q.values())
+    if not p_total or not q_total:
+        return None
+    divergence = 0.0
+    for key in p.keys() | q.keys():
+        p_i = p.get(key, 0) / p_total
+        q_i = q.get(key, 0) / q_total
+        m_i = (p_i + q_i) / 2
+        if p_i:
+            divergence += p_i * math.log2(p_i / m_i)
+        if q_i:
+            divergence += q_i * math.log2(q_i / m_i)
+    return divergence / 2
+
+
+def parse_timestamp(line):
+    """Read a leading epoch number or ISO-8601 timestamp, or None
+
+    Numbers outside TIMESTAMP_RANGE (e.g. a line starting with "404" or
+    "inf") are not taken as timestamps.
+    """
+    token = line.split(None, 1)[0] if line.strip() else ""
+    try:
+        timestamp = float(token)
+    except ValueError:
+        try:
+            timestamp = datetime.fromisoformat(token.rstrip("Z")).timestamp()
+        except (ValueError, OverflowError, OSError):
+            return None
+    low, high = TIMESTAMP_RANGE
+    if not low <= timestamp < high:
+        return None
+    return timestamp
+
+
+def buckets_by_lines(lines, size):
+    """Yield (start_line, lines) buckets of `size` lines"""
+    bucket = []
+    start = 0
+    for line in lines:
+        bucket.append(line)
+        if len(bucket) == size:
+            yield start, bucket
+            start += size
+            bucket = []
+    if bucket:
+        yield start, bucket
+
+
+def buckets_by_time(lines, seconds, max_empty=None):
+    """Yield (start_time, lines) buckets covering `seconds` each
+
+    Lines without a timestamp, or older than the current bucket, stay in the
+    current bucket; the timestamp itself is dropped so it is not counted as a
+    word. Gaps in the stream produce empty buckets so windows keep covering
+    real time; at most max_empty of them per gap, placed just before the next
+    line, since earlier ones would only add windows with nothing in them.
+    """
+    bucket = []
+    start = None
+    for line in lines:
+        timestamp = parse_timestamp(line)
+        if timestamp is not None:
+            if start is None:
+                start = timestamp - timestamp % seconds
+            elif timestamp >= start + seconds:
+                yield start, bucket
+                bucket = []
+                next_start = timestamp - timestamp % seconds
+                empty = round((next_start - start) / seconds) - 1
+                if max_empty is not None:
+                    empty = min(empty, max_empty)
+                for i in range(empty, 0, -1):
+                    yield next_start - i * seconds, []
+                start = next_start
+            parts = line.split(None, 1)
+            line = parts[1] if len(parts) > 1 else ""
+        bucket.append(line)
+    if bucket:
+        if start is None:
+            raise ValueError("no timestamps found; --by time needs lines starting "
+                             "with an epoch or ISO-8601 timestamp")
+        yield start, bucket
+
+
+class SlidingCounts:
+    """Letter and word counts of the most recent `length` buckets"""
+
+    def __init__(self, length):
+        self.length = length
+        self.buckets = deque()
+        self.letters = Counter()
+        self.words = Counter()
+        self.lines = 0
+
+    def push(self, start, letters, words, lines):
+        """Add a new bucket and subtract the one that expired"""
+        self.buckets.append((start, letters, words, lines))
+        self.letters.update(letters)
+        self.words.update(words)
+        self.lines += lines
+        if len(self.buckets) > self.length:
+            _, old_letters, old_words, old_lines = self.buckets.popleft()
+            self.letters.subtract(old_letters)
+            self.words.subtract(old_words)
+            self.lines -= old_lines
+            # Drop keys that left the window so the counters stay small
+            for counts, expired in ((self.letters, old_letters), (self.words, old_words)):
+                for key in expired:
+                    if counts[key] <= 0:
+                        del counts[key]
+
+    @property
+    def full(self):
+        return len(self.buckets) == self.length
+
+    @property
+    def start(self):
+        return self.buckets[0][0]
+
+
+def _record(number, start, end, counts, previous, top_words):
+    """Build the NDJSON record for one window"""
+    return {
+        'window': number,
+        'start': start,
+        'end': end,
+        'lines': counts.lines,
+        'letters': dict(sorted(counts.letters.items())),
+        'top_words': heapq.nlargest(top_words, counts.words.items(), key=itemgetter(1)),
+        'js_divergence': js_divergence(counts.letters, previous) if previous else None
+    }
+
+
+def iter_windows(buckets, window, slide, top_words=10, alphabet=None):
+    """Turn (start, lines) buckets into one record per window"""
+    length = window / slide
+    if length < 1 or abs(length - round(length)) > 1e-9:
+        raise ValueError("window must be a multiple of slide")
+    alphabet = get_alphabet(alphabet) if alphabet else None
+    counts = SlidingCounts(round(length))
+    previous = None
+    number = 0
+    for start, lines in buckets:
+        letters, words = count_bucket(lines, alphabet)
+        counts.push(start, letters, words, len(lines))
+        if counts.full:
+            yield _record(number, counts.start, counts.start + window, counts,
+                          previous, top_words)
+            previous = counts.letters.copy()
+            number += 1
+    # A stream shorter than one window still gets a partial record
+    if number == 0 and counts.lines:
+        record = _record(0, counts.start, counts.buckets[-1][0] + slide, counts,
+                         None, top_words)
+        record['partial'] = True
+        yield record
+
+
+def main():
+    """Read a log stream and write one NDJSON record per window"""
+    parser = argparse.ArgumentParser(description="Windowed letter/word frequencies")
+    parser.add_argument("input", nargs="?", help="log file (default: stdin)")
+    parser.add_argument("--by", choices=("lines", "time"), default="lines",
+                        help="window by line count or by leading timestamp")
+    parser.add_argument("--window", type=float, default=1000,
+                        help="window size in lines or seconds")
+    parser.add_argument("--slide", type=float,
+                        help="step between windows (default: window, i.e. tumbling)")
+    parser.add_argument("--top-words", type=int, default=10)
+    parser.add_argument("--alphabet", help="alphabet profile for letter counts")
+    args = parser.parse_args()
+
+    window = args.window
+    slide = args.slide or window
+    if args.by == "lines":
+        window, slide = int(window), int(slide)
+
+    stream = open(args.input, encoding="utf-8", errors="replace") if args.input else sys.stdin
+    try:
+        if args.by == "lines":
+            buckets = buckets_by_lines(stream, slide)
+        else:
+            buckets = buckets_by_time(stream, slide, max_empty=round(window / slide))
+        write = sys.stdout.write
+        for record in iter_windows(buckets, window, slide, args.top_words, args.alphabet):
+            write(json.dumps(record, ensure_ascii=False) + "\n")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if args.input:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# Inverted word index for frequency queries - No external libraries needed
+#
+# Index layout (all integers little-endian):
+#
+#   header     magic "LFWI", version, document count, term count,
+#              section offsets, CRC32 of everything after the header
+#   documents  per document: varint name length, UTF-8 name, varint word total,
+#              varint distinct terms
+#   terms      sorted vocabulary, front-coded like counter_snapshot, each with
+#              varint document frequency, varint total count and varint
+#              postings length
+#   postings   per term: (varint doc id gap, varint count) for each document
+#   forward    per document: uint32 term ids, then their uint32 counts; fixed
+#              width so subset queries can load them with array.frombytes
+#
+# The raw text is never stored; queries only read the counts recorded here.
+
+import argparse
+import array
+import heapq
+import math
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections import Counter
+
+from counter_snapshot import decode_varint, encode_varint
+from simple_analyzer import count_words
+
+MAGIC = b"LFWI"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQQQI")
+
+
+class WordIndexError(LookupError):
+    """Raised when an index file is corrupt or a document is unknown"""
+
+
+class IndexBuilder:
+    """Collect per-document word counts and write them as an index"""
+
+    def __init__(self):
+        self.names = []
+        self.counts = []
+        self._name_set = set()
+
+    def add_document(self, name, text):
+        """Count the words of one document and remember them"""
+        self.add_counts(name, count_words(text))
+
+    def add_counts(self, name, words):
+        """Add a document whose words have already been counted"""
+        if name in self._name_set:
+            raise WordIndexError(f"document '{name}' was already added")
+        self._name_set.add(name)
+        self.names.append(name)
+        self.counts.append(Counter(words))
+
+    def write(self, path):
+        """Write the index to path"""
+        terms = sorted(set().union(*self.counts)) if self.counts else []
+        term_ids = {term: i for i, term in enumerate(terms)}
+
+        documents = bytearray()
+        for name, words in zip(self.names, self.counts):
+            encoded = name.encode("utf-8")
+            encode_varint(len(encoded), documents)
+            documents += encoded
+            encode_varint(sum(words.values()), documents)
+            encode_varint(len(words), documents)
+
+        # Forward lists per document, gathering postings per term as we go
+        postings = [bytearray() for _ in terms]
+        last_doc = [-1] * len(terms)
+        df = [0] * len(terms)
+        totals = [0] * len(terms)
+        forward = bytearray()
+        for doc_id, words in enumerate(self.counts):
+            ids = array.array("I", sorted(term_ids[w] for w in words))
+            counts = array.array("I", (words[terms[t]] for t in ids))
+            for term_id, count in zip(ids, counts):
+                encode_varint(doc_id - last_doc[term_id], postings[term_id])
+                encode_varint(count, postings[term_id])
+                last_doc[term_id] = doc_id
+                df[term_id] += 1
+                totals[term_id] += count
+            if sys.byteorder == "big":
+                ids.byteswap()
+                counts.byteswap()
+            forward += ids.tobytes() + counts.tobytes()
+
+        dictionary = bytearray()
+        previous = b""
+        for term_id, term in enumerate(terms):
+            encoded = term.encode("utf-8")
+            shared = 0
+            limit = min(len(previous), len(encoded))
+            while shared < limit and previous[shared] == encoded[shared]:
+                shared += 1
+            encode_varint(shared, dictionary)
+            encode_varint(len(encoded) - shared, dictionary)
+            dictionary += encoded[shared:]
+            encode_varint(df[term_id], dictionary)
+            encode_varint(totals[term_id], dictionary)
+            encode_varint(len(postings[term_id]), dictionary)
+            previous = encoded
+
+        body = documents + dictionary + b"".join(postings) + forward
+        terms_at = HEADER.size + len(documents)
+        postings_at = terms_at + len(dictionary)
+        forward_at = postings_at + sum(len(p) for p in postings)
+        header = HEADER.pack(MAGIC, VERSION, 0, len(self.names), len(terms),
+                             terms_at, postings_at, forward_at, zlib.crc32(body))
+        # Write beside the target and swap it in, so readers that still map
+        # the old file keep a valid view instead of faulting on a rewrite
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class WordIndex:
+    """Read-only view of an index file, answering frequency queries"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_tables()
+        except BaseException:
+            self._buf.close()
+            raise
+
+    def _read_tables(self):
+        """Validate the header and load the document table and dictionary"""
+        buf = self._buf
+        if len(buf) < HEADER.size:
+            raise WordIndexError("index is truncated")
+        (magic, version, _, doc_count, term_count, terms_at, postings_at,
+         forward_at, crc) = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise WordIndexError("not a word index")
+        if version != VERSION:
+            raise WordIndexError(f"unsupported index version {version}")
+        with memoryview(buf) as view, view[HEADER.size:] as body:
+            if zlib.crc32(body) != crc:
+                raise WordIndexError("index checksum mismatch")
+
+        # Document table
+        self.names = []
+        self.lengths = []
+        self._forward = []
+        forward = forward_at
+        pos = HEADER.size
+        for _ in range(doc_count):
+            size, pos = decode_varint(buf, pos)
+            self.names.append(buf[pos:pos + size].decode("utf-8"))
+            pos += size
+            length, pos = decode_varint(buf, pos)
+            self.lengths.append(length)
+            distinct, pos = decode_varint(buf, pos)
+            self._forward.append((forward, distinct))
+            forward += 8 * distinct
+        self.doc_ids = {name: i for i, name in enumerate(self.names)}
+
+        # Term dictionary: term -> (document frequency, postings offset, size)
+        self.terms = []
+        self.totals = []
+        self._lookup = {}
+        previous = b""
+        offset = postings_at
+        pos = terms_at
+        for term_id in range(term_count):
+            shared, pos = decode_varint(buf, pos)
+            size, pos = decode_varint(buf, pos)
+            encoded = previous[:shared] + buf[pos:pos + size]
+            pos += size
+            df, pos = decode_varint(buf, pos)
+            total, pos = decode_varint(buf, pos)
+            length, pos = decode_varint(buf, pos)
+            term = encoded.decode("utf-8")
+            self.terms.append(term)
+            self.totals.append(total)
+            self._lookup[term] = (df, offset, length)
+            offset += length
+            previous = encoded
+
+    def close(self):
+        """Release the memory map"""
+        self._buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _resolve(self, docs):
+        """Turn document names into a set of ids (None means every document)"""
+        if docs is None:
+            return None
+        try:
+            return {self.doc_ids[name] for name in docs}
+        except KeyError as e:
+            raise WordIndexError(f"unknown document {e.args[0]!r}") from None
+
+    def _entries(self, pos, length):
+        """Decode (gap, count) pairs into (absolute id, count) pairs"""
+        end = pos + length
+        current = -1
+        buf = self._buf
+        while pos < end:
+            gap, pos = decode_varint(buf, pos)
+            count, pos = decode_varint(buf, pos)
+            current += gap
+            yield current, count
+
+    def document_frequency(self, term):
+        """Number of documents containing term"""
+        entry = self._lookup.get(term.lower())
+        return entry[0] if entry else 0
+
+    def postings(self, term):
+        """List of (document name, count) for every document containing term"""
+        entry = self._lookup.get(term.lower())
+        if not entry:
+            return []
+        _, offset, length = entry
+        return [(self.names[d], c) for d, c in self._entries(offset, length)]
+
+    def term_frequency(self, term, docs=None):
+        """Total occurrences of term, optionally limited to some documents"""
+        wanted = self._resolve(docs)
+        entry = self._lookup.get(term.lower())
+        if not entry:
+            return 0
+        _, offset, length = entry
+        return sum(c for d, c in self._entries(offset, length)
+                   if wanted is None or d in wanted)
+
+    def document_terms(self, doc_id):
+        """Arrays of term ids and counts for one document"""
+        pos, distinct = self._forward[doc_id]
+        ids = array.array("I")
+        counts = array.array("I")
+        ids.frombytes(self._buf[pos:pos + 4 * distinct])
+        counts.frombytes(self._buf[pos + 4 * distinct:pos + 8 * distinct])
+        if sys.byteorder == "big":
+            ids.byteswap()
+            counts.byteswap()
+        return ids, counts
+
+    def top_terms(self, docs=None, n=10):
+        """Most frequent (term, count) pairs over a set of documents"""
+        wanted = self._resolve(docs)
+        if wanted is None:
+            # Whole-collection totals are stored with each term
+            top = heapq.nlargest(n, range(len(self.terms)), key=self.totals.__getitem__)
+            return [(self.terms[t], self.totals[t]) for t in top]
+        totals = Counter()
+        for doc_id in sorted(wanted):
+            ids, counts = self.document_terms(doc_id)
+            totals.update(dict(zip(ids, counts)))
+        top = heapq.nlargest(n, totals.items(), key=lambda x: x[1])
+        return [(self.terms[t], c) for t, c in top]
+
+    def idf(self, term):
+        """Smoothed inverse document frequency of term"""
+        return math.log((1 + len(self.names)) / (1 + self.document_frequency(term))) + 1
+
+    def tf_idf(self, term, docs=None):
+        """TF-IDF of term for each matching document, highest first"""
+        wanted = self._resolve(docs)
+        idf = self.idf(term)
+        entry = self._lookup.get(term.lower())
+        if not entry:
+            return []
+        _, offset, length = entry
+        scores = [(self.names[d], c / self.lengths[d] * idf)
+                  for d, c in self._entries(offset, length)
+                  if wanted is None or d in wanted]
+        return sorted(scores, key=lambda x: x[1], reverse=True)
+
+
+def build_index(paths, out_path):
+    """Index text files, using each path as the document name"""
+    builder = IndexBuilder()
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            builder.add_document(path, f.read())
+    builder.write(out_path)
+    return len(builder.names)
+
+
+def main():
+    """Command line entry point: build an index and query it"""
+    parser = argparse.ArgumentParser(description="Inverted word index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="index text files")
+    build.add_argument("index")
+    build.add_argument("files", nargs="+")
+
+    for name, help_text in (("tf", "total count of a term"),
+                            ("tfidf", "TF-IDF of a term per document")):
+        query = commands.add_parser(name, help=help_text)
+        query.add_argument("index")
+        query.add_argument("term")
+        query.add_argument("--docs", nargs="+", help="limit to these documents")
+
+    top = commands.add_parser("top", help="most frequent terms")
+    top.add_argument("index")
+    top.add_argument("-n", type=int, default=10)
+    top.add_argument("--docs", nargs="+", help="limit to these documents")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "build":
+            count = build_index(args.files, args.index)
+            print(f"Indexed {count} documents into {args.index}")
+            return
+        with WordIndex(args.index) as index:
+            if args.command == "tf":
+                print(f"'{args.term}': {index.term_frequency(args.term, args.docs)}")
+            elif args.command == "tfidf":
+                for name, score in index.tf_idf(args.term, args.docs):
+                    print(f"  {name}: {score:.6f}")
+            else:
+                for term, count in index.top_terms(args.docs, args.n):
+                    print(f"  '{term}': {count}")
+    except (OSError, WordIndexError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()